@@ -1,6 +1,11 @@
 #!/bin/bash
 # ARGS: host port index_name 
 curl -X PUT -H "Content-Type: application/json" http://$1:$2/$3?pretty -d '{
+	"settings": {
+		"index": {
+			"refresh_interval": "30s"
+		}
+	},
 	"mappings": {
 		"properties": {
 			"author": {
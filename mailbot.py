@@ -28,7 +28,7 @@ class MailBot:
         if configFile is None:
             log.error("Could not initialize MailBot with None config file")
             return
-        log.info("Initializing MailBot with config file: " + configFile)
+        log.info('Initializing MailBot with config file: %s', configFile)
         configHelper = ConfigFileHelper(configFile)
         self.conf = configHelper.getConf()
         # Check for critical things needed in the configuration.
@@ -65,12 +65,12 @@ class MailBot:
             return
         for query in self.conf['queries']:
             if isinstance(query, dict) is False:
-                log.warning('A query in the queries configuration is not a dictionary. Rather it is: ' + str(query) + ". Skipping. See DESIGN.md")
+                log.warning('A query in the queries configuration is not a dictionary. Rather it is: %s. Skipping. See DESIGN.md', query)
                 continue
             replyDictionary = {}
             # Set up the contents, check to ensure they are there first.
             if 'title' not in query:
-                log.warning('A query in the queries configuration has no title. This is necessary. Skipping: ' + str(query))
+                log.warning('A query in the queries configuration has no title. This is necessary. Skipping: %s', query)
                 continue
             replyDictionary['title'] = query['title']
             replyDictionary['replies'] = []
@@ -95,16 +95,16 @@ class MailBot:
             # First check for key components of the query that have to be there for Mailbot to function.
             if 'query' not in query:
                 # This is critically essential. If not there, log a warning and continue on.
-                log.warning('Query doesn\'t have any "query" criteria. Skipping over: ' + str(query))
+                log.warning('Query doesn\'t have any "query" criteria. Skipping over: %s', query)
                 continue
             if 'title' not in query:
                 # Also essential> Title is the unique ID of the query and used prominently in the e-mail
-                log.warning('Query doesn\'t have any "title" criteria. Skipping over ' + str(query))
+                log.warning('Query doesn\'t have any "title" criteria. Skipping over %s', query)
                 continue
             # Pull out the "query" part and stick that in its own dictionary. The rest of it is metadata needed later, e.g. 'title'
             # Elastic search will not want any of that, it just wants a dictionary with one term: "query"
             queryDict = { "query": query["query"] }
-            log.debug('Query to Elastic Search is: ' + str(queryDict))
+            log.debug('Query to Elastic Search is: %s', queryDict)
             # Issue a scan, as we want to get all records to process.
             scanner = self.elasticSearchHelper.scan(queryDict)
             for scannedResult in scanner:
@@ -132,12 +132,12 @@ class MailBot:
         if 'text' in record:
             prepared['text'] = record['text']
         else:
-            log.warning('No text data found in Elastic Search record: ' + str(record))
+            log.warning('No text data found in Elastic Search record: %s', record)
             return None
         if 'mmid' in record:
             prepared['mmid'] = record['mmid']
         else:
-            log.warning('No Media Mail ID (mmid) found in Elastic Search record: ' + str(record))
+            log.warning('No Media Mail ID (mmid) found in Elastic Search record: %s', record)
             return None
         if 'url' in record:
             prepared['link'] = record['url']
@@ -228,7 +228,7 @@ class MailBot:
         # Assemble the full body
         fullBody = header + '\n' + body + '\n' + footer
         # Log at info the body.
-        log.info('Email to be sent:\n------------------\n' + str(fullBody) + '\n\n------\nEnd Email\n')
+        log.info('Email to be sent:\n------------------\n%s\n\n------\nEnd Email\n', fullBody)
         # Remove all characters not ascii.
         fullBody = fullBody.encode('ascii', errors='ignore')
         # Now gather the meta data and put into a MIMEText
@@ -266,10 +266,10 @@ class MailBot:
                     server.ehlo()  # Can be omitted
                     # Only log on if username and password is presented.
                     if smtp_username is not None and smtp_password is not None:
-                        log.debug("Logging on with configured username: " + smtp_username + " and password.")
+                        log.debug('Logging on with configured username: %s and password.', smtp_username)
                         server.login(smtp_username, smtp_password)
                     # Send the mail.
-                    log.debug('Attempting to send message from: ' + str(sender_email) + ' to user email: ' + str(user_email))
+                    log.debug('Attempting to send message from: %s to user email: %s', sender_email, user_email)
                     server.sendmail(eml['From'], { eml['To'], sender_email }, eml.as_string())
                     # If we get here then the email was sent.
                     log.debug('Sent Successfully!')
@@ -278,9 +278,9 @@ class MailBot:
                 # OK. Try again, but not forever..
                 if nextAttempt > 2600:
                     # Doing the math, the user has now waited 42 minutes after 6 retries.
-                    log.error('Failed to send message: ' + str(e) + ". Have tried now for more than 40 minutes. Giving up.")
+                    log.error('Failed to send message: %s. Have tried now for more than 40 minutes. Giving up.', e)
                     break
-                log.error('Failed to send message: ' + str(e) + ". Trying again in " + str(int(nextAttempt)) + " seconds.")
+                log.error('Failed to send message: %s. Trying again in %s seconds.', e, int(nextAttempt))
                 time.sleep(nextAttempt)
                 # Now double the next attempt.
                 nextAttempt = nextAttempt * 2
@@ -312,12 +312,12 @@ class MailBot:
         # This requires title to be in the input query as that is the key in the dictionary.
         if 'title' not in query:
             # Also essential> Title is the unique ID of the query and used prominently in the e-mail
-            log.warning('Query doesn\'t have any "title" criteria. Skipping over parsing results for ' + str(query))
+            log.warning('Query doesn\'t have any "title" criteria. Skipping over parsing results for %s', query)
             return
         # The hit limit needs to be there too, or use the default.
         hit_limit = 10
         if 'hit_limit' not in query:
-            log.debug('Unspecified hit limit in the query entitled: ' + str(query['title']) + ". Using default of 10.")
+            log.debug('Unspecified hit limit in the query entitled: %s. Using default of 10.', query['title'])
         else:
             hit_limit = int(query['hit_limit'])
         # The author screen name should be there, or use Unidentified
@@ -334,7 +334,7 @@ class MailBot:
         # Ensure that we have found the replyToUse before going forward.
         if replyToUse is None:
             # Didn't find it?
-            log.warning('Did not find the reply for query title: ' + query['title'] + ' in the globalReply. The class wasn\'t set up right. Skipping updateGlobalReply for this title.')
+            log.warning("Did not find the reply for query title: %s in the globalReply. The class wasn't set up right. Skipping updateGlobalReply for this title.", query['title'])
             return
         repliesList = replyToUse['replies']
         # Now scan over all of the existing replies in this list to see if the text has already been set (e.g. a duplicate message). If so, don't go further.
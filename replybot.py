@@ -27,7 +27,7 @@ class ReplyBot:
         if configFile is None:
             log.error("Could not initialize ReplyBot with None config file")
             return
-        log.info("Initializing ReplyBot with config file: " + configFile)
+        log.info('Initializing ReplyBot with config file: %s', configFile)
         configHelper = ConfigFileHelper(configFile)
         self.conf = configHelper.getConf()
         # Check for critical things needed in the configuration.
@@ -95,7 +95,7 @@ class ReplyBot:
                 cleanedLine = cleanedLine[:len(cleanedLine) - 1]
             # else: If anything else, just skip that line.
             cleanedMessage += cleanedLine
-        log.debug('Email message downloaded: ' + cleanedMessage)
+        log.debug('Email message downloaded: %s', cleanedMessage)
         # Now, the result of this is to have a glob of text that needs parsing for the [ and ] of the mmid token.
         parsed = cleanedMessage.split('[')
         for part in parsed:
@@ -104,7 +104,7 @@ class ReplyBot:
                 if part[5] == ']':
                     # Good, now pull out the contents and do a deli token check.
                     token = part[:5]
-                    log.debug('Found potential deli token: ' + token)
+                    log.debug('Found potential deli token: %s', token)
                     # Check for black listed tokens
                     if self.mmidHelper.isBlacklisted(token):
                         log.debug('Skipping blacklisted token.')
@@ -128,27 +128,23 @@ class ReplyBot:
             log.warning('Can not process a like to the mmid given as it was None or not length 5.')
             return 
                 # Now that everything checks out on the inputs, get the MMID from Elastic Search
-        matchQuery = {}
-        matchQuery['query'] = {}
-        matchQuery['query']['match'] = {}
-        matchQuery['query']['match']['mmid'] = mmid
-        log.debug('Trying to query Elastic Search for the mmid: ' + mmid)        
-        elasticSearchResult = self.elasticSearchHelper.query(matchQuery)
+        log.debug('Trying to query Elastic Search for the mmid: %s', mmid)        
+        elasticSearchResult = self.elasticSearchHelper.queryByMmid(mmid)
         if elasticSearchResult is None or isinstance(elasticSearchResult, dict) is False:
             # Failed query?
             # This is actually pretty serious and needs at least WARN level, perhaps more?
-            log.warning('No resulting MMID found in Elastic Search: ' + mmid)
+            log.warning('No resulting MMID found in Elastic Search: %s', mmid)
             return  # Nothing else we can do.
         log.debug('Found result in Elastic Search')
         # Now parse out the results found in the search.
-        parsedResults = self.elasticSearchHelper.parseQueryResults(elasticSearchResult, mmid)
+        parsedResults = self.elasticSearchHelper.parseQueryResults(elasticSearchResult)
         result = {}
         if len(parsedResults) > 0:
             result = parsedResults[0]
         else:
             # No matches found.
             # This is actually pretty serious and needs at least WARN level, perhaps more?
-            log.warning('No resulting MMID found in Elastic Search: ' + mmid)
+            log.warning('No resulting MMID found in Elastic Search: %s', mmid)
             return  # Nothing else we can do.
         # Depending on the source given, we process the like differently
         if 'source' not in result:
@@ -163,14 +159,14 @@ class ReplyBot:
                 return
             try:
                 tweetId = result['url'].split('/')[len(result['url'].split('/')) - 1]
-                log.debug('Liking found tweet ID: ' + str(tweetId))
+                log.debug('Liking found tweet ID: %s', tweetId)
                 self.myTwitterHelper.favorite(tweetId)
             except Exception as e:
                 # Some problem in splitting up the url?
-                log.warning('Could not get the tweetId from the url: ' + str(result['url']) + '. Ignoring.')
+                log.warning('Could not get the tweetId from the url: %s. Ignoring.', result['url'])
         else:
             # Unsupported platform.
-            log.warning('Record for MMID: ' + mmid + ' has an unsupported source: ' + source + ". Ignoring.")
+            log.warning('Record for MMID: %s has an unsupported source: %s. Ignoring.', mmid, source)
     
     def processMessage(self, mmid, messageBody):
         '''
@@ -191,7 +187,7 @@ class ReplyBot:
             command = messageBody.lstrip().split(' ')[0]
         except Exception as e:
             # This means that there is nothing other than maybye that first leading space.
-            log.warning('Failed to process command given: ' + command)
+            log.warning('Failed to process command given: %s', command)
             return
         # Now process the supported commands
         if command == 'like' or command == 'favorite':
@@ -208,10 +204,10 @@ class ReplyBot:
             try:
                 self.processReply(mmid, body)
             except Exception as e:
-                log.error('Failed to process a reply: '+str(e))
+                log.error('Failed to process a reply: %s', e)
         else:
             # Not supported. Log only at debug.
-            log.debug('Unsupported command: ' + command)
+            log.debug('Unsupported command: %s', command)
     
     def processReply(self, mmid, body):
         '''
@@ -227,30 +223,26 @@ class ReplyBot:
             parts = body.split(' ')
             if len(parts) <= 1:
                 # Can't have just a reply without a message.
-                log.warning('Could not reply as the message given is not long enough: ' + body)
+                log.warning('Could not reply as the message given is not long enough: %s', body)
                 return 
         # Now that everything checks out on the inputs, get the MMID from Elastic Search
-        matchQuery = {}
-        matchQuery['query'] = {}
-        matchQuery['query']['match'] = {}
-        matchQuery['query']['match']['mmid'] = mmid
-        log.debug('Trying to query Elastic Search for the mmid: ' + mmid)        
-        elasticSearchResult = self.elasticSearchHelper.query(matchQuery)
+        log.debug('Trying to query Elastic Search for the mmid: %s', mmid)        
+        elasticSearchResult = self.elasticSearchHelper.queryByMmid(mmid)
         if elasticSearchResult is None or isinstance(elasticSearchResult, dict) is False:
             # Failed query?
             # This is actually pretty serious and needs at least WARN level, perhaps more?
-            log.warning('No resulting MMID found in Elastic Search: ' + mmid)
+            log.warning('No resulting MMID found in Elastic Search: %s', mmid)
             return  # Nothing else we can do.
         log.debug('Found result in Elastic Search')
         # Now parse out the results found in the search.
-        parsedResults = self.elasticSearchHelper.parseQueryResults(elasticSearchResult, mmid)
+        parsedResults = self.elasticSearchHelper.parseQueryResults(elasticSearchResult)
         result = {}
         if len(parsedResults) > 0:
             result = parsedResults[0]
         else:
             # No matches found.
             # This is actually pretty serious and needs at least WARN level, perhaps more?
-            log.warning('No resulting MMID found in Elastic Search: ' + mmid)
+            log.warning('No resulting MMID found in Elastic Search: %s', mmid)
             return  # Nothing else we can do.
         # Depending on the source given, we process the like differently
         if 'source' not in result:
@@ -269,7 +261,7 @@ class ReplyBot:
                 tweetId = result['url'].split('/')[len(result['url'].split('/')) - 1]
             except Exception as e:
                 # Some problem in splitting up the url?
-                log.warning('Could not get the tweetId from the url: ' + str(result['url']) + '. Ignoring.')
+                log.warning('Could not get the tweetId from the url: %s. Ignoring.', result['url'])
                 return 
             # Now, pull out the author_screen_name which is needed for all Twitter replies
             if 'author_screen_name' not in result or result['author_screen_name'] is None:
@@ -277,12 +269,12 @@ class ReplyBot:
                 return
             # And put the author screen name into the message reply
             author = result['author_screen_name']            
-            log.debug('Replying to this tweetID:' + str(tweetId) + ' to this author: ' + author + ' with this message: ' + body)
+            log.debug('Replying to this tweetID:%s to this author: %s with this message: %s', tweetId, author, body)
             self.myTwitterHelper.reply(tweetId, body, author)
             log.debug('Done')                
         else:
             # Unsupported platform.
-            log.warning('Record for MMID: ' + mmid + ' has an unsupported source: ' + source + ". Ignoring.")
+            log.warning('Record for MMID: %s has an unsupported source: %s. Ignoring.', mmid, source)
     
     def readMail(self):
         '''
@@ -295,7 +287,7 @@ class ReplyBot:
         try:
             server = poplib.POP3(self.conf['email']['server'])
         except Exception as e:
-            log.error('Failed to connect to sever via POP3. No mail downloaded or read.', e)
+            log.error('Failed to connect to sever via POP3. No mail downloaded or read. Exception is: %s', e)
             return
         # Login
         log.debug('Logging on to server...')
@@ -303,7 +295,7 @@ class ReplyBot:
             server.user(self.conf['email']['username'])
             server.pass_(self.conf['email']['password'])
         except Exception as e:
-            log.error('Failed to log in with supplied username and password in configuration. No mail downloaded or read.', e)
+            log.error('Failed to log in with supplied username and password in configuration. No mail downloaded or read. Exception is: %s', e)
             return
         # List items on server
         resp = None
@@ -313,21 +305,21 @@ class ReplyBot:
         try:
             resp, items, octets = server.list()
         except Exception as e:
-            log.error('Failed to list items on the server. No mail downloaded or read.', e)
+            log.error('Failed to list items on the server. No mail downloaded or read. Exception is: %s', e)
             return
-        log.debug('Response is: ' + str(resp) + ' items are: ' + str(items) + ' octets are: ' + str(octets))
+        log.debug('Response is: %s items are: %s octets are: %s', resp, items, octets)
         if len(items) == 0:
             # No mail!
             log.info('No mail to process. Try again later!')
             return
         for item in items:
-            log.debug('Pulling down item id: ' + str(item))
+            log.debug('Pulling down item id: %s', item)
             id, size = str(item).split("'")[1].split(' ')
-            log.debug('ID is: ' + str(id) + ' and size is: ' + str(size))
+            log.debug('ID is: %s and size is: %s', id, size)
             resp, text, octets = server.retr(id)
-            log.info('Processing email with id: ' + str(id))
+            log.info('Processing email with id: %s', id)
             self.processEmail(text)
-            log.debug('Deleting the email with id: ' + str(id))
+            log.debug('Deleting the email with id: %s', id)
             deleteResponse = server.dele(id)
         # And now we're done, call quit.
         log.debug('Finishing up by calling quit on the server.')
@@ -1,16 +1,22 @@
 import argparse
 import jaraco.logging
-import json
 import logging
+import random
+import re
+import time
 from tweepy import OAuthHandler
 from tweepy import Stream
 from tweepy.streaming import StreamListener
 from tweepy.utils import parse_datetime
 from textblob import TextBlob
-from utils import ConfigFileHelper, TwitterHelper, ElasticSearchHelper, ScoringHelper
+from utils import ConfigFileHelper, TwitterHelper, ElasticSearchHelper, ScoringHelper, parseJson
 
 log = logging.getLogger(__name__)
 
+# Twitter interleaves control messages with tweets on a stream. None of these carry tweet text, so they can be recognized by their leading key and skipped without parsing.
+# See https://developer.twitter.com/en/docs/twitter-api/v1/tweets/filter-realtime/guides/streaming-message-types
+_CONTROL_MESSAGE_PREFIXES = ('{"delete"', '{"limit"', '{"scrub_geo"', '{"status_withheld"', '{"user_withheld"', '{"disconnect"', '{"warning"')
+
 
 class TwitterBot(StreamListener):
     '''
@@ -27,12 +33,29 @@ class TwitterBot(StreamListener):
         if configFile is None:
             log.error("Could not initialize TwitterBot with None config file")
             return
-        log.info("Initializing TwitterBot with config file: " + configFile)
+        log.info('Initializing TwitterBot with config file: %s', configFile)
         configHelper = ConfigFileHelper(configFile)
         self.conf = configHelper.getConf()
         self.twitterHelper = TwitterHelper(self.conf)
         self.scoringHelper = ScoringHelper(self.conf)
-        log.debug(str(self.conf))
+        log.debug('Loaded configuration: %s', self.conf)
+        # Pre-compute the filters once so that on_data does not have to walk the configuration for every tweet.
+        # The black and white listed words are lower cased here. The blacklist is compiled into a single pattern so any blacklisted word is found in one pass over the tweet text.
+        self.languages = None
+        self.commonWords = frozenset()
+        self.minimumScore = None
+        self.blacklistPattern = None
+        self.whitelistWords = []
+        if 'filters' in self.conf:
+            filtersConf = self.conf['filters']
+            if isinstance(filtersConf.get('languages'), list):
+                self.languages = frozenset(filtersConf['languages'])
+            self.commonWords = frozenset(filtersConf.get('common_words', []))
+            self.minimumScore = filtersConf.get('minimum_score')
+            blacklistWords = [str(word).lower() for word in filtersConf.get('blacklist_words', []) if len(str(word)) > 0]
+            if len(blacklistWords) > 0:
+                self.blacklistPattern = re.compile('|'.join(re.escape(word) for word in blacklistWords))
+            self.whitelistWords = [str(word).lower() for word in filtersConf.get('whitelist_words', [])]
         # Elastic Search: setup
         if 'elastic' not in self.conf:
             # No elastic search means nothing we can insert data into. Fail out.
@@ -57,21 +80,25 @@ class TwitterBot(StreamListener):
         if 'twitter' not in self.conf:
             log.error('No twitter section in configuration. Failing out.')
             return
-        if 'consumer_key' not in self.conf['twitter'] or len(str(self.conf['twitter']['consumer_key'])) == 0:
-            log.error('Failed to initialize access to twitter. Consumer key provided in configuration is: ' + str(self.conf['twitter']['consumer_key']))
+        twitterConf = self.conf['twitter']
+        if not twitterConf.get('consumer_key'):
+            log.error('Failed to initialize access to twitter. Consumer key provided in configuration is: %s', twitterConf.get('consumer_key'))
             return
-        if 'consumer_secret' not in self.conf['twitter'] or len(str(self.conf['twitter']['consumer_secret'])) == 0:
-            log.error('Failed to initialize access to twitter. Consumer secret provided in configuration is: ' + str(self.conf['twitter']['consumer_secret']))
+        if not twitterConf.get('consumer_secret'):
+            log.error('Failed to initialize access to twitter. Consumer secret provided in configuration is: %s', twitterConf.get('consumer_secret'))
             return
-        if 'access_token' not in self.conf['twitter'] or len(str(self.conf['twitter']['access_token'])) == 0:
-            log.error('Failed to initialize access to twitter. Access token provided in configuration is: ' + str(self.conf['twitter']['access_token']))
+        if not twitterConf.get('access_token'):
+            log.error('Failed to initialize access to twitter. Access token provided in configuration is: %s', twitterConf.get('access_token'))
             return
-        if 'access_token_secret' not in self.conf['twitter'] or len(str(self.conf['twitter']['access_token_secret'])) == 0:
-            log.error('Failed to initialize access to twitter. Access token secret provided in configuration is: ' + str(self.conf['twitter']['access_token_secret']))
+        if not twitterConf.get('access_token_secret'):
+            log.error('Failed to initialize access to twitter. Access token secret provided in configuration is: %s', twitterConf.get('access_token_secret'))
             return
-        self.auth = OAuthHandler(self.conf['twitter']['consumer_key'], self.conf['twitter']['consumer_secret'])
-        self.auth.set_access_token(self.conf['twitter']['access_token'], self.conf['twitter']['access_token_secret'])
+        self.auth = OAuthHandler(twitterConf['consumer_key'], twitterConf['consumer_secret'])
+        self.auth.set_access_token(twitterConf['access_token'], twitterConf['access_token_secret'])
+        # Set up an error counter to track consecutive errors. This has to exist before any filter starts the stream, as on_error may be called right away.
+        self.twitterErrorCounter = 0
         # Create instance of the tweepy stream using myself as a listener.
+        # Tweepy's default retry settings already follow Twitter's reconnect guidelines, see on_error.
         self.myStream = Stream(self.auth, listener=self, tweet_mode='extended')
         # Set up the queries based on what is put in the queries section of the configuration. Check to see if it is set.
         if 'queries' not in self.conf:
@@ -87,7 +114,18 @@ class TwitterBot(StreamListener):
             elif len(locations) == 0:
                 log.error('The configured aois to query for Twitter are not valid. The list should contain quadruplets of floating values. Instead, it has nothing in it. See DESIGN.md for more information. No query to Twitter is made.')
                 return
-            log.debug('Calling filter on Twitter with locations: ' + str(locations))
+            # Each quadruplet must be made of numbers and its south west corner has to be below and to the left of its north east corner.
+            try:
+                locations = [float(location) for location in locations]
+            except (TypeError, ValueError) as e:
+                log.error('The configured aois to query for Twitter are not valid. The list should contain quadruplets of floating values. Instead, it has a non-number in it: %s. See DESIGN.md for more information. No query to Twitter is made.', e)
+                return
+            for i in range(0, len(locations), 4):
+                swLon, swLat, neLon, neLat = locations[i:i + 4]
+                if swLon >= neLon or swLat >= neLat:
+                    log.error('The configured aois to query for Twitter are not valid. The bounding box: %s does not have its south west corner below and to the left of its north east corner. See DESIGN.md for more information. No query to Twitter is made.', locations[i:i + 4])
+                    return
+            log.debug('Calling filter on Twitter with locations: %s', locations)
             self.myStream.filter(locations=locations, is_async=True)
             log.info('Filter set! Twitter is now scanning these aois.')
         elif 'followers' in self.conf['queries']:
@@ -101,7 +139,7 @@ class TwitterBot(StreamListener):
             stringFollowers = []
             for intFollower in followers:
                 stringFollowers += [str(intFollower)]
-            log.debug('Calling filter on Twitter with followers: ' + str(stringFollowers))
+            log.debug('Calling filter on Twitter with followers: %s', stringFollowers)
             self.myStream.filter(follow=stringFollowers, is_async=True)
             log.info('Filter set! Twitter is now scanning these followers.')
         elif 'tracks' in self.conf['queries']:
@@ -111,11 +149,9 @@ class TwitterBot(StreamListener):
             if len(tracks) == 0:
                 log.error('The configured tracks list to query is empty. It needs to have at least one key word. See DESIGN.md. No query to Twitter is made')
                 return
-            log.debug('Calling filter on Twitter with tracks: ' + str(tracks))            
+            log.debug('Calling filter on Twitter with tracks: %s', tracks)            
             self.myStream.filter(track=tracks, is_async=True)
             log.info('Filter set! Twitter is now scanning these tracks.')
-        # Set up an error counter to track consecutive errors
-        self.twitterErrorCounter = 0
             
     def on_data(self, data):
         '''        
@@ -127,12 +163,17 @@ class TwitterBot(StreamListener):
         if data is None:
             log.warning('Incoming data from Twitter was None. Ignoring')
             return
+        # Control messages, such as deletes, are most of what is not a tweet. Skip them before spending time on parsing.
+        if isinstance(data, str) and data.startswith(_CONTROL_MESSAGE_PREFIXES):
+            log.debug('Incoming data is a Twitter control message, not a tweet. Ignoring.')
+            return
         # Parse the data into a JSON dictionary
         tweetData = {}
         try:
-            tweetData = json.loads(data)
-        except Exception as e:
-            log.warning('Failed to load the tweet JSON into a dictionary: ' + str(e))
+            tweetData = parseJson(data)
+        except ValueError as e:
+            # Both the json and orjson decode errors are ValueErrors.
+            log.warning('Failed to load the tweet JSON into a dictionary: %s', e)
             return
         # Pull out the text.
         tweetText = self.twitterHelper.getTweetText(tweetData)
@@ -142,38 +183,38 @@ class TwitterBot(StreamListener):
             # This can happen if the tweet is a delete statement or anything else.
             log.debug('Incoming tweetData had None for text. Could be a delete message. Ignoring.')
             return
-        log.debug('Incoming tweet, text: ' + str(tweetText))        
+        log.debug('Incoming tweet, text: %s', tweetText)        
         # Reset the self.twitterErrorCounter to zero. We have something that is good.
         self.twitterErrorCounter = 0
         # Next, check the language of the tweet and only allow further processing if the language is configured as supported.
-        if 'filters' in self.conf and 'languages' in self.conf['filters'] and self.conf['filters']['languages'] is not None and isinstance(self.conf['filters']['languages'], list):
+        if self.languages is not None:
             # Now look at the language of the tweet:
             if 'lang' in tweetData and tweetData['lang'] is not None:
                 languageOfTweet = tweetData['lang']
-                if languageOfTweet in self.conf['filters']['languages']:
+                if languageOfTweet in self.languages:
                     # This is acceptable.
                     log.debug('Tweet is an acceptable langugage by the configured language filter.')
                 else:
                     # Not acceptable
-                    log.debug('Tweet has language: ' + str(languageOfTweet) + ' which is not in the configured language filter. Ignoring.')
+                    log.debug('Tweet has language: %s which is not in the configured language filter. Ignoring.', languageOfTweet)
                     return
             else:
                 # If the tweet doesn't have a language but we do have filters, we can not let it pass.
                 log.debug('Tweet has no specified language, thus it can not be verified in the list of filtered languages. Ignoring.')
                 return
         # Check black and white listed words in the text, in that order.
-        if 'filters' in self.conf and 'blacklist_words' in self.conf['filters']:
-            for word in self.conf['filters']['blacklist_words']:
-                if str(word).lower() in str(tweetText).lower():
-                    # Blacklisted. Ignore it.
-                    log.debug('Tweet contained blacklisted word: ' + str(word) + '. Ignoring.')
-                    return
-        if 'filters' in self.conf and 'whitelist_words' in self.conf['filters']:
-            for word in self.conf['filters']['whitelist_words']:
-                if str(word).lower() not in str(tweetText).lower():
-                    # Whitelisted. Ignore it.
-                    log.debug('Tweet did not contain whitelisted word: ' + str(word) + '. Ignoring.')
-                    return        
+        lowerTweetText = str(tweetText).lower()
+        if self.blacklistPattern is not None:
+            blacklistMatch = self.blacklistPattern.search(lowerTweetText)
+            if blacklistMatch is not None:
+                # Blacklisted. Ignore it.
+                log.debug('Tweet contained blacklisted word: %s. Ignoring.', blacklistMatch.group(0))
+                return
+        for word in self.whitelistWords:
+            if word not in lowerTweetText:
+                # Whitelisted. Ignore it.
+                log.debug('Tweet did not contain whitelisted word: %s. Ignoring.', word)
+                return
         # Next we pull out of the tweet data all the things needed to put into Elastic Search
         authorName = None
         authorLocation = None
@@ -197,9 +238,8 @@ class TwitterBot(StreamListener):
             if "'" in token:
                 continue
             # Now eliminate configured common words.
-            if 'filters' in self.conf and 'common_words' in self.conf['filters']:
-                if token in self.conf['filters']['common_words']:
-                    continue
+            if token in self.commonWords:
+                continue
             # Now check for size greater than three
             if len(token) > 3:
                 # Its a keeper but we are going to strip @ and # for tokens
@@ -243,38 +283,45 @@ class TwitterBot(StreamListener):
         url = None
         if 'id_str' in tweetData:
             url = 'https://twitter.com/x/status/' + tweetData['id_str']
-        log.debug('Creating Elastic Search data. Locality confidence is: '+str(localityConfidence))
+        log.debug('Creating Elastic Search data. Locality confidence is: %s', localityConfidence)
         elasticSearchDictionary = self.elasticSearchHelper.createRecord(authorName, authorLocation, screenName, createdAt, hashtags, location, localityConfidence, placeName, placeFullName, textB.sentiment.polarity, references, 'twitter', sentiment, textB.sentiment.subjectivity, tweetText, tokens, url)
-        log.debug('Data record is: ' + str(elasticSearchDictionary))
+        log.debug('Data record is: %s', elasticSearchDictionary)
         # Filter out low scoring records.
-        if 'filters' in self.conf and 'minimum_score' in self.conf['filters']:
+        if self.minimumScore is not None:
             log.debug('Now scoring the data record to see if it meets minimum scoring criteria')
-            minimumScore = self.conf['filters']['minimum_score']
+            minimumScore = self.minimumScore
             tweetScore = self.scoringHelper.scoreContent(elasticSearchDictionary)['overall']
             if tweetScore <= minimumScore:
                 # Nope, ignore it.
-                log.debug('The tweet data given is too low in value, its score was: ' + str(tweetScore) + " and minimally needed: " + str(minimumScore))
+                log.debug('The tweet data given is too low in value, its score was: %s and minimally needed: %s', tweetScore, minimumScore)
                 return
             else:
-                log.debug('The tweet data given is high enough in value, its score was: ' + str(tweetScore) + " and minimally needed: " + str(minimumScore))
+                log.debug('The tweet data given is high enough in value, its score was: %s and minimally needed: %s', tweetScore, minimumScore)
         log.debug('Storing Elastic Search data')
         self.elasticSearchHelper.storeData(elasticSearchDictionary)
         log.debug('Elastic Search update complete')
                                 
     def on_error(self, status):
         '''
-        Processes error messages that come from Twitter via the use of the query.
+        Processes error messages that come from Twitter via the use of the query. Tweepy then waits according to its default retry settings before reconnecting. When Twitter is rate limiting, a random jitter is added on top of that wait so that bots restarted together do not all reconnect at the same moment.
         
         -- status unknown type, this is an error message. Required, if None nothing will happen.
+        @return boolean, True so that Tweepy keeps the stream alive and reconnects.
         '''
         if status is None:
-            return
-        log.debug('Incoming error from the Twitter query issued: ' + str(status))
+            return True
+        log.debug('Incoming error from the Twitter query issued: %s', status)
         if self.twitterErrorCounter >= 3:
             # Log this at error if we're getting a lot of consecutive errors
-            log.error('Receiving consistent errors from Twitter. Suggest restarting. Error is: ' + str(status))
+            log.error('Receiving consistent errors from Twitter. Suggest restarting. Error is: %s', status)
         else:
             self.twitterErrorCounter += 1
+        if status == 420 or status == 429:
+            # Rate limited. The jitter grows with the number of consecutive errors.
+            jitter = random.uniform(0, self.twitterErrorCounter)
+            log.debug('Twitter is rate limiting the query. Waiting an additional %s seconds before reconnecting.', jitter)
+            time.sleep(jitter)
+        return True
 
     
 def get_args():
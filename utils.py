@@ -1,14 +1,127 @@
-import base62
-import elasticsearch.helpers
+import atexit
+import copy
+import functools
 import logging
 import json
-import tweepy
+import os
+import re
+import threading
 import time
-from elasticsearch import Elasticsearch
-from tweepy import OAuthHandler
+# Note: elasticsearch and tweepy are imported inside the helpers that use them, so a bot only pays for loading the libraries it needs.
 
 log = logging.getLogger(__name__)
 
+# Note: orjson is optional, see the fast extra in setup.cfg. When it is installed it parses and writes JSON several times faster than the json module.
+try:
+    import orjson
+    parseJson = orjson.loads
+except ImportError:
+    orjson = None
+    parseJson = json.loads
+
+# The digits of an MMID, in the order of the pybase62 default character set that MMIDs were first written with.
+_BASE62_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+# MMIDs are five base 62 digits, so they wrap after this many 1/100ths of a second, see MMIDHelper.generateID.
+_MMID_TOTAL_CODES = (62 * 62 * 62 * 62 * 62) - 1
+# The only sentiments a record may carry, see ElasticSearchHelper.createRecord.
+_VALID_SENTIMENTS = frozenset(['negative', 'neutral', 'positive'])
+# One Elasticsearch client per (host, port), shared by every ElasticSearchHelper in the process along with its connection pool.
+_elasticsearch_clients = {}
+
+
+def _coerce_float(value, low, high):
+    '''
+    Turns a value into a float that lies within a range.
+    
+    -- value object, anything float() accepts such as a number or a numeric string. Required.
+    -- low float, the smallest allowed value, inclusive. Required.
+    -- high float, the largest allowed value, inclusive. Required.
+    @return float, the value as a float or None if it is not a number or is outside of the range.
+    '''
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number < low or number > high:
+        return None
+    return number
+
+
+def _keyword_points(scoringConf, key, description):
+    '''
+    Reads a dictionary of keyword:points from the scoring section of the configuration, see ScoringHelper.
+    
+    -- scoringConf dictionary, the scoring section of the configuration. Required.
+    -- key string, the name of the keyword dictionary in the scoring section, e.g. interested_words. Required.
+    -- description string, what the keywords are for, used in the DEBUG logs. Required.
+    @return list of (string, integer) tuples, each keyword lower cased with its points. Keywords with a non-integer value score zero points. Empty if the dictionary is not configured properly.
+    '''
+    if key not in scoringConf:
+        return []
+    if not isinstance(scoringConf[key], dict):
+        log.debug('Could not score keywords of %s, the value provided in the configuration is not a dictionary of string:int. See DESIGN.md.', description)
+        return []
+    keywordPoints = []
+    for keyword in scoringConf[key]:
+        points = 0
+        try:
+            points = int(scoringConf[key][keyword])
+        except Exception as e:
+            log.debug('Keyword of %s has a non-integer value for word: %s', description, keyword)
+        keywordPoints.append((keyword.lower(), points))
+    return keywordPoints
+
+
+def _orjson_serializer():
+    '''
+    Builds a serializer for the Elastic Search client that writes request bodies with orjson rather than the json module. Only used when orjson is installed.
+    
+    @return JSONSerializer, to be given to the Elasticsearch client as its serializer.
+    '''
+    from elasticsearch.serializer import JSONSerializer
+
+    class OrjsonSerializer(JSONSerializer):
+
+        def dumps(self, data):
+            # Already serialized bodies, such as bulk lines, are passed through as-is like the JSONSerializer does.
+            if isinstance(data, str):
+                return data
+            # The client joins bodies as strings, so the bytes orjson gives back are decoded.
+            return orjson.dumps(data, default=self.default).decode('utf-8')
+
+    return OrjsonSerializer()
+
+
+@functools.lru_cache(maxsize=64)
+def _load_json_file(path, mtimeNs, size):
+    '''
+    Parses a JSON file into a dictionary. Results are cached on the path, modification time and size of the file, so an unchanged file is parsed only once while an edited file is parsed again. At most 64 files are kept, the least recently used being dropped first, so long running processes that reload their configuration do not grow without bound.
+    
+    -- path string, the absolute location of the JSON file. Required.
+    -- mtimeNs integer, the modification time of the file in nanoseconds. Required, used only as part of the cache key.
+    -- size integer, the size of the file in bytes. Required, used only as part of the cache key.
+    @return dictionary, the parsed JSON. It is shared between callers and must not be modified.
+    '''
+    # Read the raw bytes, both parsers take them directly and decode the UTF-8 themselves.
+    with open(path, 'rb') as f:
+        return parseJson(f.read())
+
+
+def _read_json_file(path):
+    '''
+    Reads a JSON file through the _load_json_file cache.
+    
+    -- path string, the location of the JSON file. Required, any error in reading or parsing the file is raised to the caller. A file that is valid JSON but not an object raises a ValueError too.
+    @return dictionary, the parsed JSON. It is shared between callers and must not be modified.
+    @see _load_json_file
+    '''
+    absolutePath = os.path.abspath(path)
+    stat = os.stat(absolutePath)
+    parsed = _load_json_file(absolutePath, stat.st_mtime_ns, stat.st_size)
+    if not isinstance(parsed, dict):
+        raise ValueError('Expected a JSON object but found: ' + type(parsed).__name__)
+    return parsed
+
 
 class ConfigFileHelper:
     '''
@@ -19,34 +132,32 @@ class ConfigFileHelper:
     def __init__(self, configFile):
         '''
         Initializes the class and loads in configuration details from the file. First looks into the folder where configFile is and if a global.json is there, loads that into memory. Then proceeds to load configurationFile and overwrites any property that is found in global.json.
+        Whether a file exists is found out by reading it, there is no separate existence check.
                 
         -- configFile string, the location of the JSON config file to load. Required, without it nothing is loaded and an empty internal dictionary is set up. An error is logged in that case and the global conf variable will remain empty.
         '''
-        log.debug('Attempting to load configFile: ' + configFile + ' and any global.json found in that folder.')
+        log.debug('Attempting to load configFile: %s and any global.json found in that folder.', configFile)
         self.conf = {}
         if configFile is None:
             log.error('Failed to load configuration file, None was passed in as a parameter to ConfigFileHelper. An empty configuration dictionary will result.')
             return
-        parts = configFile.split('/')
-        globalJsonFile = '/'.join(parts[:len(parts) - 1]) + '/global.json'
+        globalJsonFile = os.path.join(os.path.dirname(configFile), 'global.json')
         try:
-            with open(globalJsonFile) as f:
-                data = json.load(f)
-                for key in data:
-                    self.conf[key] = data[key]
-            log.debug('Loaded global.json file found at: ' + globalJsonFile)
-        except Exception as e:
-            # Failed to load global.json. It may not exist, or other problem.
-            log.warning('Failed to load: ' + globalJsonFile + '. Proceeding to load configFile on itself. Exception is: ' + str(e))
+            # The parsed file is shared through the cache, so take a deep copy. Otherwise a change to a nested section of this conf would show up in every later ConfigFileHelper.
+            self.conf.update(copy.deepcopy(_read_json_file(globalJsonFile)))
+            log.debug('Loaded global.json file found at: %s', globalJsonFile)
+        except FileNotFoundError:
+            # There is no global.json, which is fine.
+            log.debug('No global.json found at: %s. Proceeding to load configFile on itself.', globalJsonFile)
+        except (OSError, ValueError) as e:
+            # Failed to load global.json. It could not be read or is not a valid JSON object.
+            log.warning('Failed to load: %s. Proceeding to load configFile on itself. Exception is: %s', globalJsonFile, e)
         # And now load configFile on top of this.
         try:
-            with open(configFile) as f:
-                data = json.load(f)
-                for key in data:
-                    self.conf[key] = data[key]
-        except Exception as e:
-            log.error('Failed to load: ' + configFile + ". This will result in an empty configuration. Exception is: " + str(e))
-        log.info('Loaded configuration file: ' + configFile + ' successfully.')
+            self.conf.update(copy.deepcopy(_read_json_file(configFile)))
+        except (OSError, ValueError) as e:
+            log.error('Failed to load: %s. This will result in an empty configuration. Exception is: %s', configFile, e)
+        log.info('Loaded configuration file: %s successfully.', configFile)
         
     def getConf(self):
         '''
@@ -55,6 +166,13 @@ class ConfigFileHelper:
         @return dictionary, the configuration loaded by this file. May be empty, but is never None
         '''
         return self.conf
+    
+    @classmethod
+    def invalidate(cls):
+        '''
+        Forgets every configuration file parsed so far, so the next ConfigFileHelper reads them from disk again. Edited files are already picked up by their changed modification time or size, this is for forcing a reload such as on a SIGHUP.
+        '''
+        _load_json_file.cache_clear()
 
 
 class ElasticSearchHelper:
@@ -65,14 +183,49 @@ class ElasticSearchHelper:
 
     def __init__(self, elasticSearchHost, elasticSearchPort, elasticSearchIndex, conf):
         '''
-        Initializes the ElasticSearchhelper class instance
+        Initializes the ElasticSearchHelper class instance
         
         -- elasticSearchHost string, the host name where to find Elastic Search. Required, if not given, an error will be issued and the class will not set up a connection.
         -- elasticSearchPort integer, the port to connect to Elastic Search with. Required, if not given, an error will be issued and the class will not set up a connection.
         -- elasticSearchIndex string, the name of the index to send data and queries to. Required, if not given, an error will be issued and the class will not set up a connection.
-        -- conf dictionary, the configuration of the bot, as loaded in the ConfigFileHelper.
+        -- conf dictionary, the configuration of the bot, as loaded in the ConfigFileHelper. The optional batch_size in its elastic section sets how many records storeData buffers before sending them to Elastic Search in one bulk request. If not given, each record is sent as it is stored. The optional flush_interval in seconds moves the sending onto a background thread, which also sends a partial batch once that long has passed. The optional max_chunk_bytes caps the size of a single bulk request. The optional bulk_threads sends that many bulk requests to Elastic Search at once when a flush holds more than one.
         @see ConfigFileHelper
         '''
+        # Stays None if the host, port or index is missing or the client can not be created, in which case storing and querying do nothing.
+        self.elasticSearch = None
+        self.elasticSearchIndex = None
+        # Records waiting to be sent to Elastic Search in bulk, see storeData. The lock guards the list when flushing in the background.
+        self.pendingRecords = []
+        self.pendingRecordsLock = threading.Lock()
+        self.batchSize = 1
+        # Set by storeData to wake the background thread once a batch is full, see flushInBackground.
+        self.flushWanted = threading.Event()
+        self.flushInterval = None
+        # Extra arguments for elasticsearch.helpers.bulk, see flush.
+        self.bulkArguments = {}
+        self.bulkThreads = 1
+        if conf is not None and 'elastic' in conf and 'batch_size' in conf['elastic']:
+            try:
+                self.batchSize = max(1, int(conf['elastic']['batch_size']))
+            except Exception as e:
+                log.warning('The batch_size in the elastic section of the configuration is not an integer. Sending each record as it is stored. Exception is: %s', e)
+        if conf is not None and 'elastic' in conf and 'flush_interval' in conf['elastic']:
+            try:
+                self.flushInterval = float(conf['elastic']['flush_interval'])
+                if self.flushInterval <= 0:
+                    self.flushInterval = None
+            except Exception as e:
+                log.warning('The flush_interval in the elastic section of the configuration is not a number. Sending records on the storing thread. Exception is: %s', e)
+        if conf is not None and 'elastic' in conf and 'max_chunk_bytes' in conf['elastic']:
+            try:
+                self.bulkArguments['max_chunk_bytes'] = max(1, int(conf['elastic']['max_chunk_bytes']))
+            except Exception as e:
+                log.warning('The max_chunk_bytes in the elastic section of the configuration is not an integer. Using the default bulk request size. Exception is: %s', e)
+        if conf is not None and 'elastic' in conf and 'bulk_threads' in conf['elastic']:
+            try:
+                self.bulkThreads = max(1, int(conf['elastic']['bulk_threads']))
+            except Exception as e:
+                log.warning('The bulk_threads in the elastic section of the configuration is not an integer. Sending one bulk request at a time. Exception is: %s', e)
         if elasticSearchHost is None:
             log.error('Could not initialize Elastic Search with a None host name given.')
             return
@@ -82,13 +235,27 @@ class ElasticSearchHelper:
         if elasticSearchIndex is None:
             log.error('Could not initialize Elastic Search because the index supplied is None.')
             return
-        try:
-            self.elasticSearch = Elasticsearch(['http://' + elasticSearchHost + ':' + str(elasticSearchPort)])
-        except Exception as e:
-            log.error('Failed to initialize connection to Elastic Search: ' + str(e))
+        clientKey = (elasticSearchHost, str(elasticSearchPort))
+        if clientKey in _elasticsearch_clients:
+            self.elasticSearch = _elasticsearch_clients[clientKey]
+        else:
+            try:
+                from elasticsearch import Elasticsearch
+                clientArguments = {}
+                if orjson is not None:
+                    clientArguments['serializer'] = _orjson_serializer()
+                # Keep a pool of live connections so repeated queries and bulk inserts reuse them, and gzip request bodies since bulk JSON compresses well.
+                self.elasticSearch = Elasticsearch(['http://' + elasticSearchHost + ':' + str(elasticSearchPort)], http_compress=True, maxsize=25, timeout=30, retry_on_timeout=True, max_retries=3, **clientArguments)
+                _elasticsearch_clients[clientKey] = self.elasticSearch
+            except Exception as e:
+                log.error('Failed to initialize connection to Elastic Search: %s', e)
         self.elasticSearchIndex = elasticSearchIndex
         # This class also needs access to an instance of MMIDHelper.
         self.mmidHelper = MMIDHelper(conf)
+        # Send whatever is still buffered when the bot exits, so a partial batch is not lost.
+        atexit.register(self.flush)
+        if self.flushInterval is not None:
+            threading.Thread(target=self.flushInBackground, name='ElasticSearchFlush', daemon=True).start()
              
     def createRecord(self, author=None, authorLocation=None, authorScreenName='Unknown', createdAt=None, hashtags=[], location=None, localityConfidence=0.0, placeName=None, placeFullName=None, polarity=None, references=[], source=None, sentiment=None, subjectivity=None, text=None, tokens=[], url=None):
         '''
@@ -103,7 +270,7 @@ class ElasticSearchHelper:
         -- locatlityConfidence float, a number from 0.0 to 1.0 indicating the confidence on how local to the configured location this author is physically. Required, default is 0.0. If a non-number or out of range number is provided, then a DEBUG log will be made and nothing done.
         -- placeName string, the name of the place the author of the message is. Optional, not required to be put into the index.
         -- placeFullName string, the full unabbreviated place name the author of the message is. Optional not required to be put into the index.
-        -- polatity float, a number -1.0 to 1.0. @see https://en.wikipedia.org/wiki/Sentiment_analysis. Optional, not required to be put in the index. If provided, it must be a float type and within the range. If not, it will not be put into the index.
+        -- polarity float, a number -1.0 to 1.0. @see https://en.wikipedia.org/wiki/Sentiment_analysis. Optional, not required to be put in the index. If provided, it must be a float type and within the range. If not, it will not be put into the index.
         -- references list of string, a list of references made within the text (e.g. @johndoe). Optional, if not provided then an empty list is indexed.
         -- sentiment string, @see https://en.wikipedia.org/wiki/Sentiment_analysis. Should be one of ['negative','neutral','positive']. Optional, not required to be put into the index.
         -- source string, the name of the social media platform storing data. Optional, not required to be put into the index.
@@ -111,8 +278,15 @@ class ElasticSearchHelper:
         -- text string, the body of the message being indexed. Required, without it there is no data. If not provided, then a DEBUG log will be made and nothing done.
         -- tokens list of string, the text of the message broken down into single words for token matching purposes. Optional, if not provided then an empty list is indexed.
         -- url string, the URL directly to the message on the media platform. Optional. If not supplied, nothing will be put in the index.        
-        @return dictionary, containing all the fields given that could be stored directly as data into ElasticSeach
+        @return dictionary, containing all the fields given that could be stored directly as data into ElasticSearch
         '''
+        # The required fields are checked first, so that nothing is built for a record that is going to be rejected.
+        if createdAt is None:
+            log.debug('Provided data to store has None createdAt. Ignoring.')
+            return
+        if text is None:
+            log.debug('Provided data to store has None text. Ignoring.')
+            return
         body = {}
         # Check each field for None and then do the appropriate actions.
         if author is not None:
@@ -121,25 +295,15 @@ class ElasticSearchHelper:
             body['author_location'] = authorLocation
         if authorScreenName is not None:
             body['author_screen_name'] = authorScreenName
-        if createdAt is not None:
-            body['created_at'] = createdAt
-        else:
-            log.debug('Provided data to store has None createdAt. Ignoring.')
-            return
+        body['created_at'] = createdAt
         if hashtags is not None and isinstance(hashtags, list):
             body['hashtags'] = hashtags
         if location is not None:
             body['location'] = location
         if localityConfidence is not None:
-            lC = 0.0
-            try:
-                lC = float(localityConfidence)
-            except Exception as e:
-                # Not a number?
-                log.debug('Provided data has a locality confidence that is not a float. Ignoring. Reason: '+str(e))
-                return
-            if lC < 0.0 or lC > 1.0:
-                log.debug('Provided data has a locality confidence that is not between 0.0 and 1.0 inclusive. Ignoring.')
+            lC = _coerce_float(localityConfidence, 0.0, 1.0)
+            if lC is None:
+                log.debug('Provided data has a locality confidence that is not a float between 0.0 and 1.0 inclusive. Ignoring.')
                 return
             body['locality_confidence'] = lC
         else:
@@ -149,37 +313,23 @@ class ElasticSearchHelper:
         if placeFullName is not None:
             body['place_full_name'] = placeFullName
         if polarity is not None:
-            pol = 0.0
-            try:
-                pol = float(polarity)
-                if pol >= -1.0 or pol <= 1.0:
-                    body['polarity'] = pol
-                # If not in the range, don't set polarity
-            except:
-                # Not a number. Just don't set polarity
-                pass
+            # If not a number or not in the range, don't set polarity
+            pol = _coerce_float(polarity, -1.0, 1.0)
+            if pol is not None:
+                body['polarity'] = pol
         if references is not None and isinstance(references, list):
             body['references'] = references
         if sentiment is not None:
-            if sentiment == 'neutral' or sentiment == 'positive' or sentiment == 'negative':
+            if sentiment in _VALID_SENTIMENTS:
                 body['sentiment'] = sentiment
         if source is not None:
             body['source'] = source
         if subjectivity is not None:
-            sub = 0.0
-            try:
-                sub = float(subjectivity)
-                if sub >= -1.0 or sub <= 1.0:
-                    body['subjectivity'] = sub
-                # If not in the range, don't set polarity
-            except:
-                # Not a number. Just don't set polarity
-                pass
-        if text is not None:
-            body['text'] = text
-        else:
-            log.debug('Provided data to store has None text. Ignoring.')
-            return
+            # If not a number or not in the range, don't set subjectivity
+            sub = _coerce_float(subjectivity, -1.0, 1.0)
+            if sub is not None:
+                body['subjectivity'] = sub
+        body['text'] = text
         if tokens is not None and isinstance(tokens, list):
             body['tokens'] = tokens
         if url is not None:
@@ -187,11 +337,52 @@ class ElasticSearchHelper:
         # Generate a unique ID.
         # TODO #21-Move-MMID-Generation-out-of-ElasticSearchHelper: This next line seems like it should not be in this class. It makes a cleaner design to pass this in. It makes ElasticSearchHelper no longer need a MMIDHelper and the oddity of the constructor requiring the entire configuration after only requiring a sub-set. Remove this here and put it in the calling class.
         body['mmid'] = self.mmidHelper.generateID()
-        # wait 0.01 to the next record, to ensure it would have a unique mmid.
-        time.sleep(0.01)
         # All done!
         return body
 
+    def flush(self):
+        '''
+        Sends every record buffered by storeData to Elastic Search in bulk requests of up to batch_size records. Nothing happens if no records are waiting. Records Elastic Search rejects are logged and dropped, they do not stop the rest of the batch.
+        
+        @see storeData
+        '''
+        with self.pendingRecordsLock:
+            if len(self.pendingRecords) == 0:
+                return
+            records = self.pendingRecords
+            self.pendingRecords = []
+        log.debug('Bulk inserting %s records into Elastic Search.', len(records))
+        try:
+            import elasticsearch.helpers
+            if self.bulkThreads > 1 and len(records) > self.batchSize:
+                # More than one bulk request to make, so send them side by side.
+                indexed = 0
+                errors = []
+                for succeeded, item in elasticsearch.helpers.parallel_bulk(self.elasticSearch, records, thread_count=self.bulkThreads, chunk_size=self.batchSize, raise_on_error=False, **self.bulkArguments):
+                    if succeeded:
+                        indexed += 1
+                    else:
+                        errors.append(item)
+            else:
+                indexed, errors = elasticsearch.helpers.bulk(self.elasticSearch, records, chunk_size=self.batchSize, raise_on_error=False, **self.bulkArguments)
+        except Exception as e:
+            log.error('Could not bulk index %s records in Elastic Search: %s', len(records), e)
+            return
+        log.debug('Bulk inserted %s records into Elastic Search.', indexed)
+        if len(errors) > 0:
+            log.error('Elastic Search rejected %s of %s records. The first error is: %s', len(errors), len(records), errors[0])
+
+    def flushInBackground(self):
+        '''
+        Runs on the background thread started when flush_interval is configured. Flushes whenever storeData fills a batch, or once flush_interval seconds pass without one, so records never wait longer than that. Never returns.
+        
+        @see flush
+        '''
+        while True:
+            self.flushWanted.wait(self.flushInterval)
+            self.flushWanted.clear()
+            self.flush()
+
     def parseQueryResults(self, queryResults, mmid=None):
         '''
         The contents of a query in Elastic Search have a lot of extra Elastic Search metadata in them. This method will pull out the record(s) stored as-is and return them in a list.
@@ -200,47 +391,21 @@ class ElasticSearchHelper:
         -- mmid string, by specifying an mmid an exact match will be checked on the records prior to returning them. Only matches with this mmid will be returned.
         @return a list of dictionary, these are the original record formats put in via storeData, @see storeData
         '''
-        workingResultsReturned = []
-        if queryResults is None or isinstance(queryResults, dict) is False:
+        if queryResults is None or not isinstance(queryResults, dict):
             log.debug('Input queryResults is None or not a dictionary. Returning an empty list.')
-            return workingResultsReturned
+            return []
         # Content is in { "hits" : { "hits" : [ { "_source" : {HERE} } ... ] } }
-        if 'hits' not in queryResults or isinstance(queryResults['hits'], dict) is False:
-            log.debug('Unrecognizes query results, expecting hits to be in top level: ' + str(queryResults))
-            return workingResultsReturned
+        if 'hits' not in queryResults or not isinstance(queryResults['hits'], dict):
+            log.debug('Unrecognized query results, expecting hits to be in top level: %s', queryResults)
+            return []
         innerHits = queryResults['hits']
-        if 'hits' not in innerHits or isinstance(innerHits['hits'], list) is False:
-            log.debug('Unrecognizes query results, expecting hits to be in {"hits":{}}: ' + str(queryResults))
-            return workingResultsReturned
-        # Each item in the results also needs to be cleaned up.
-        for esRecord in innerHits['hits']:
-            if isinstance(esRecord, dict) is False:
-                log.debug('Inner hits are not dictionaries, skipping.')
-                continue
-            if '_source' not in esRecord:
-                log.debug('The field _source is not specified in the list item of an inner hit. Skipping')
-                continue
-            source = esRecord['_source']
-            # This should be a dictionary.
-            if isinstance(source, dict) is False:
-                log.debug('The _source of an Elastic Search hit is not a dictionary? skipping.')
-                continue
-            workingResultsReturned += [source]
-        # Additional checks.
-        resultsReturned = []
-        for result in workingResultsReturned:
-            # TODO #20-Create-Elastic-Search-Indecies-with-Mappings: If this is done, a mapping can be made to eliminate the need to do extra work here for mmid matchin as that can be put into the query.
-            if mmid is not None and 'mmid' in result:
-                # Check match
-                if result['mmid'] == mmid:
-                    resultsReturned += [result]  # Match found.
-                else:
-                    # Skip, we don't want this one.
-                    continue
-            # If there are no additional filters to try out, keep it.
-            resultsReturned += [result]
-        # Return results.
-        return resultsReturned
+        if 'hits' not in innerHits or not isinstance(innerHits['hits'], list):
+            log.debug('Unrecognized query results, expecting hits to be in {"hits":{}}: %s', queryResults)
+            return []
+        # Pull the stored record out of each hit, reading _source only once.
+        sources = [esRecord.get('_source') for esRecord in innerHits['hits'] if isinstance(esRecord, dict)]
+        # Keep every record that is a dictionary and, when an mmid is given, only those that exactly match it. Prefer queryByMmid, which has Elastic Search do the exact matching.
+        return [source for source in sources if isinstance(source, dict) and (mmid is None or source.get('mmid') == mmid)]
             
     def query(self, queryDict):
         '''
@@ -252,39 +417,74 @@ class ElasticSearchHelper:
         if queryDict is None:
             log.warning('Could not query Elastic Search with None query dictionary.')
             return
+        if self.elasticSearch is None:
+            log.warning('Could not query Elastic Search as the connection to it was never set up.')
+            return
         try:
            return self.elasticSearch.search(index=self.elasticSearchIndex, body=queryDict)
         except Exception as e:
-            log.error('Failed query to Elastic Search for this query: ' + str(queryDict) + " Error is: " + str(e))
+            log.error('Failed query to Elastic Search for this query: %s Error is: %s', queryDict, e)
+            
+    def queryByMmid(self, mmid):
+        '''
+        Queries Elastic Search for the records with exactly the given MMID. The match is made on the keyword sub field of mmid, so Elastic Search does the exact matching and only those records are sent back.
         
-    def scan(self, queryDict):
+        -- mmid string, 5 characters long [A-Za-z0-9]. Required. Without this being set, a WARNING log is issued and nothing happens.
+        @return dictionary result of issuing the query, @see query
         '''
-        Queries Elastic Search with a single query and returns the results of the query.
+        if mmid is None:
+            log.warning('Could not query Elastic Search for a None MMID.')
+            return
+        return self.query({'query': {'bool': {'filter': [{'term': {'mmid.keyword': mmid}}]}}})
+        
+    def scan(self, queryDict, size=5000, scroll='5m', sourceIncludes=None):
+        '''
+        Queries Elastic Search with a single query and returns the results of the query. Results come back in whatever order the shards produce them.
         
         -- queryDict dictionary. Elastic Search uses dictionaries with "query" in them to return results. Required. Without this being set, a WARNING log is issued and nothing happens.
+        -- size integer. Optional. How many records are fetched per scroll round trip, defaults to 5000.
+        -- scroll string. Optional. How long Elastic Search keeps the scroll context alive between round trips, defaults to '5m'.
+        -- sourceIncludes list. Optional. If given, only these fields of each record's _source are sent back by Elastic Search.
         @return iterator this can be used to scan over a list of results all in JSON string format.
         '''
         if queryDict is None:
             log.warning('Could not query Elastic Search with None query dictionary.')
             return
+        if self.elasticSearch is None:
+            log.warning('Could not query Elastic Search as the connection to it was never set up.')
+            return
+        scanArguments = {}
+        if sourceIncludes is not None:
+            scanArguments['_source_includes'] = sourceIncludes
         try:
-            return elasticsearch.helpers.scan(self.elasticSearch, index=self.elasticSearchIndex, query=queryDict)
+            import elasticsearch.helpers
+            return elasticsearch.helpers.scan(self.elasticSearch, index=self.elasticSearchIndex, query=queryDict, size=size, scroll=scroll, preserve_order=False, **scanArguments)
         except Exception as e:
-            log.error('Failed query to Elastic Search for this query: ' + str(queryDict) + " Error is: " + str(e))
+            log.error('Failed query to Elastic Search for this query: %s Error is: %s', queryDict, e)
         
     def storeData(self, elasticSearchDictionary):
         '''
-        Stores the given dictionary into Elastic Search
+        Stores the given dictionary into Elastic Search. Records are buffered and sent in bulk once batch_size of them are waiting, see flush. With flush_interval configured the sending is left to the background thread, so this never waits on Elastic Search.
         
         -- elasticSearchDictionary, dictionary. Required. Should come from calling createRecord. If None is supplied, nothing happens outside of a warning.
         @see createRecord
+        @see flush
         '''
-        log.debug('Inserting into Elastic Search this record: ' + str(elasticSearchDictionary))
-        try:
-            self.elasticSearch.index(index=self.elasticSearchIndex,
-                     body=elasticSearchDictionary)
-        except Exception as e:
-            log.error("Could not index in Elastic Search: " + str(e))
+        if elasticSearchDictionary is None:
+            log.warning('Could not store a None record in Elastic Search.')
+            return
+        if self.elasticSearch is None:
+            log.warning('Could not store a record in Elastic Search as the connection to it was never set up.')
+            return
+        log.debug('Inserting into Elastic Search this record: %s', elasticSearchDictionary)
+        with self.pendingRecordsLock:
+            self.pendingRecords.append({'_index': self.elasticSearchIndex, '_source': elasticSearchDictionary})
+            batchFull = len(self.pendingRecords) >= self.batchSize
+        if batchFull:
+            if self.flushInterval is None:
+                self.flush()
+            else:
+                self.flushWanted.set()
 
 
 class MMIDHelper:
@@ -300,26 +500,46 @@ class MMIDHelper:
         -- config dictionary, the loaded properties from the configuration files for the bot. Required, if None then an error is logged and nothing happens.
         @see ConfigFileHelper
         '''
+        # The last 1/100th of a second handed out as an ID, see generateID.
+        self.lastTick = 0
+        # The MMIDs that must not be used, see isBlacklisted. The configuration is checked once here rather than on every call.
+        self.blacklist = frozenset()
         if config is None:
             log.error('Failed to initialize MMIDHelper as provided config dictionary is None. MMIDHelper is not set up properly.')
             return
         self.conf = config
+        if 'tokens' not in self.conf:
+            # No token configuration. Can't check blacklist.
+            log.debug('Could not set up blacklist as no token section in configuration is set up.')
+        elif 'blacklist' not in self.conf['tokens']:
+            # No blacklist configuration. Can't check blacklist.
+            log.debug('Could not set up blacklist as no blacklist section in the tokens in the configuration was set up.')
+        elif isinstance(self.conf['tokens']['blacklist'], list):
+            self.blacklist = frozenset(self.conf['tokens']['blacklist'])
+        else:
+            log.debug('The configuration of the blacklist tokens in the configuration is not a list. Any check for blacklist tokens will be False.')
     
     def generateID(self):
         '''
-        Media Mail needs an ID associated with each record to be put into the Elastic Search record store and used later for looking up records. IDs are 5 alpha-numeric characters based on wall time.
+        Media Mail needs an ID associated with each record to be put into the Elastic Search record store and used later for looking up records. IDs are 5 alpha-numeric characters based on wall time. Each call is given its own 1/100th of a second, so calls made faster than that never share an ID and the caller does not have to wait between them.
         
          @return string, 5 characters long [A-Za-z0-9] unique to the 1/100th of a second.
         '''
         # The code generated is based on the hundreths of second past epoch
+        # Note: this stays on the wall clock. A monotonic clock starts over at every reboot, so IDs would repeat ones already stored in Elastic Search. A clock stepping backwards is already covered by lastTick below.
         timeNow = int(time.time() * 100)
+        # If that 1/100th of a second was already handed out, take the next one. A burst of IDs runs ahead of wall time until the calls slow down again.
+        self.lastTick = max(self.lastTick + 1, timeNow)
         # We use a reference number (62^5-1) to generate five 62-digit characters
-        totalCodes = (62 * 62 * 62 * 62 * 62) - 1
         # timeNow % totalCodes gives us a unique number for this 1/100th of 1 second.
         # this is unique for 916132832 1/100ths of a second or about 3.5 months.
-        code = timeNow % totalCodes
-        code62 = base62.encode(code).zfill(5)
-        return code62
+        code = self.lastTick % _MMID_TOTAL_CODES
+        # Write the code out as five base 62 digits, least significant first, including leading zeros.
+        digits = []
+        for i in range(5):
+            code, remainder = divmod(code, 62)
+            digits.append(_BASE62_DIGITS[remainder])
+        return ''.join(reversed(digits))
     
     def isBlacklisted(self, mmid):
         '''
@@ -331,22 +551,8 @@ class MMIDHelper:
         if mmid is None:
             log.debug('Can not check blacklist of tokens if given a None MMID. False returned')
             return False
-        if 'tokens' not in self.conf:
-            # No token configuration. Can't check blacklist.
-            log.debug('Could not check blacklist as no token section in configuration is set up.')
-            return False
-        if 'blacklist' not in self.conf['tokens']:
-            # No blacklist configuration. Can't check blacklist.
-            log.debug('Could not check blacklist as no blacklist section in the tokens in the configuration was set up.')
-            return False
-        if isinstance(self.conf['tokens']['blacklist'], list):
-            # Now check contents.
-            if mmid in self.conf['tokens']['blacklist']:
-                return True
-        else:
-            log.debug('The configuration of the blacklist tokens in the configuration is not a list. Any check for blacklist tokens will be False.')
-        # All other cases, just return False.
-        return False
+        # An empty blacklist, including one that was missing or bad in the configuration, holds nothing.
+        return mmid in self.blacklist
 
 
 class TwitterHelper:
@@ -366,26 +572,57 @@ class TwitterHelper:
             log.error('Failed to initialize TwitterHelper as provided config dictionary is None. TwitterHelper is not set up properly.')
             return
         self.conf = config
+        # Prepare the locality configuration once, lower cased where it is compared without case, so localityCheckOfAPlace does not redo this for every tweet.
+        # localTowns stays None when there is no locality section, in which case no place is ever local.
+        self.localTowns = None
+        self.localTownsLower = []
+        self.localTownsPattern = None
+        self.stateAbbreviation = ''
+        self.stateAbbreviationLower = ''
+        self.stateFullLower = ''
+        if 'locality' in self.conf:
+            # Missing or null values count as not set. Anything else of the wrong type is logged here once, rather than failing on every tweet.
+            localityConf = self.conf['locality'] if isinstance(self.conf['locality'], dict) else {}
+            localTowns = localityConf.get('local_towns') or []
+            stateAbbreviation = localityConf.get('state_abbreviation') or ''
+            stateFull = localityConf.get('state_full') or ''
+            if not isinstance(self.conf['locality'], dict) or not isinstance(localTowns, list) or not all(isinstance(town, str) for town in localTowns) or not isinstance(stateAbbreviation, str) or not isinstance(stateFull, str):
+                log.warning('The locality section of the configuration should have a list of strings in local_towns and strings in state_abbreviation and state_full. No place will be considered local. See DESIGN.md.')
+            else:
+                self.localTowns = frozenset(localTowns)
+                self.localTownsLower = [town.lower() for town in self.localTowns]
+                if len(self.localTownsLower) > 0:
+                    # Finds any of the local towns within a place name in a single pass.
+                    self.localTownsPattern = re.compile('|'.join(re.escape(town) for town in self.localTownsLower))
+                self.stateAbbreviation = stateAbbreviation
+                self.stateAbbreviationLower = stateAbbreviation.lower()
+                self.stateFullLower = stateFull.lower()
+        # The same few place names come up again and again in a stream of tweets, so remember the answer for each one. The answer only depends on the locality configuration above, which does not change.
+        self.localityCheckOfAPlace = functools.lru_cache(maxsize=4096)(self.localityCheckOfAPlace)
          # Now look up the consumer_key, consumer_secret, access_token, access_token_secret in config.
         if 'twitter' not in self.conf:
             log.error('No twitter section in configuration. Failing out.')
             return
-        if 'consumer_key' not in self.conf['twitter'] or len(str(self.conf['twitter']['consumer_key'])) == 0:
-            log.error('Failed to initialize access to twitter. Consumer key provided in configuration is: ' + str(self.conf['twitter']['consumer_key']))
+        twitterConf = self.conf['twitter']
+        if not twitterConf.get('consumer_key'):
+            log.error('Failed to initialize access to twitter. Consumer key provided in configuration is: %s', twitterConf.get('consumer_key'))
             return
-        if 'consumer_secret' not in self.conf['twitter'] or len(str(self.conf['twitter']['consumer_secret'])) == 0:
-            log.error('Failed to initialize access to twitter. Consumer secret provided in configuration is: ' + str(self.conf['twitter']['consumer_secret']))
+        if not twitterConf.get('consumer_secret'):
+            log.error('Failed to initialize access to twitter. Consumer secret provided in configuration is: %s', twitterConf.get('consumer_secret'))
             return
-        if 'access_token' not in self.conf['twitter'] or len(str(self.conf['twitter']['access_token'])) == 0:
-            log.error('Failed to initialize access to twitter. Access token provided in configuration is: ' + str(self.conf['twitter']['access_token']))
+        if not twitterConf.get('access_token'):
+            log.error('Failed to initialize access to twitter. Access token provided in configuration is: %s', twitterConf.get('access_token'))
             return
-        if 'access_token_secret' not in self.conf['twitter'] or len(str(self.conf['twitter']['access_token_secret'])) == 0:
-            log.error('Failed to initialize access to twitter. Access token secret provided in configuration is: ' + str(self.conf['twitter']['access_token_secret']))
+        if not twitterConf.get('access_token_secret'):
+            log.error('Failed to initialize access to twitter. Access token secret provided in configuration is: %s', twitterConf.get('access_token_secret'))
             return
         # Set up an OAuthHandler for the helper class to use.
         log.debug('Setting up the self auth OAuthHandler for the helper class.')
-        self.auth = OAuthHandler(self.conf['twitter']['consumer_key'], self.conf['twitter']['consumer_secret'])
-        self.auth.set_access_token(self.conf['twitter']['access_token'], self.conf['twitter']['access_token_secret'])
+        import tweepy
+        self.auth = tweepy.OAuthHandler(twitterConf['consumer_key'], twitterConf['consumer_secret'])
+        self.auth.set_access_token(twitterConf['access_token'], twitterConf['access_token_secret'])
+        # One API instance is shared by every call so that its HTTP session can be reused.
+        self.api = tweepy.API(self.auth)
         log.debug('Done!')
     
     def favorite(self, idoftweet):
@@ -399,15 +636,14 @@ class TwitterHelper:
             log.warning('The ID of the tweet to favorite was None. Ignoring.')
             return
         # Make API call
-        log.debug('Setting up API for the call')
-        api = tweepy.API(self.auth)
         reply = ""
-        log.debug("Liking this tweet: " + str(idoftweet))
+        log.debug('Liking this tweet: %s', idoftweet)
         try:
-            reply = api.create_favorite(id=int(idoftweet))
+            # Stream listeners already hold the ID as an integer, only strings need converting.
+            reply = self.api.create_favorite(id=idoftweet if isinstance(idoftweet, int) else int(idoftweet))
             log.debug("Tweet liked")
         except Exception as e:
-            log.warning("Error in liking the tweet: " + str(e) + " with reply: " + str(reply))
+            log.warning('Error in liking the tweet: %s with reply: %s', e, reply)
         
     def getTweetText(self, tweetData):
         '''
@@ -419,18 +655,17 @@ class TwitterHelper:
         if tweetData is None:
             log.debug('Tweet contains no text within it, as the tweetData given was None.')
             return None
-        if "extended_tweet" in tweetData:
+        extendedTweet = tweetData.get('extended_tweet')
+        if extendedTweet is not None:
             # Special class of Tweets have their data in this location. Check here first.
-           return tweetData['extended_tweet']['full_text']
-        elif 'retweeted_status' in tweetData:
-            # Retweets have their text data somewhere else.
-            if 'extended_tweet' in tweetData['retweeted_status'] and 'full_text' in tweetData['retweeted_status']['extended_tweet']:
-                return tweetData['retweeted_status']['extended_tweet']['full_text']            
+            return extendedTweet.get('full_text')
+        retweetedStatus = tweetData.get('retweeted_status')
+        if retweetedStatus is not None:
+            # Retweets have their text data somewhere else. Only extended retweets are used.
+            return (retweetedStatus.get('extended_tweet') or {}).get('full_text')
         # Otherwise, try just 'text' at the top level.
-        elif 'text' in tweetData:
-            return tweetData['text']          
         # Else... it could be delete. Ignore whatever it is and return None.
-        return None
+        return tweetData.get('text')
     
     def localityCheckOfATweet(self, tweetData):
         """
@@ -442,21 +677,12 @@ class TwitterHelper:
         if tweetData is None:
             log.debug('Tweet contains no place information in it as the tweetData given was None.')
             return False
-        town1 = None
-        town2 = None
-        town3 = None
-        log.debug(str(tweetData))
-        if 'place' in tweetData and tweetData['place'] is not None:
-            if 'full_name' in tweetData['place']:
-                town1 = tweetData['place']['full_name']
-            if 'name' in tweetData['place']:
-                town2 = tweetData['place']['name']
-        elif 'user' in tweetData:
-            if 'location' in tweetData['user']:
-                town3 = tweetData['user']['location']
-        if self.localityCheckOfAPlace(town1) or self.localityCheckOfAPlace(town2) or self.localityCheckOfAPlace(town3):
-            return True
-        return False
+        log.debug('Checking the locality of this tweet: %s', tweetData)
+        place = tweetData.get('place')
+        if place is not None:
+            return self.localityCheckOfAPlace(place.get('full_name')) or self.localityCheckOfAPlace(place.get('name'))
+        # No place attached, fall back on the location the user typed into their profile.
+        return self.localityCheckOfAPlace((tweetData.get('user') or {}).get('location'))
                 
     def localityCheckOfAPlace(self, placeFullName):
         """
@@ -468,49 +694,28 @@ class TwitterHelper:
         if placeFullName is None:
             log.debug('The placeFullName given was None. Returning False.')
             return False
-        # Pull out the various parts of the configuration needed
-        if 'locality' not in self.conf:
+        if self.localTowns is None:
             # No locality set in the configuration. Nothing can ever be True now, so return False.
             return False
-        local_towns = []
-        state_abbreviation = ""
-        state_full = ""
-        if 'local_towns' in self.conf['locality']:
-            local_towns = self.conf['locality']['local_towns']
-        if 'state_abbreviation' in self.conf['locality']:
-            state_abbreviation = self.conf['locality']['state_abbreviation']
-        if 'state_full' in self.conf['locality']:
-            state_full = self.conf['locality']['state_full']        
+        placeFullNameLower = placeFullName.lower()
         # Locality Check assumes False first.
-        try:
+        town = placeFullName.split(",")
+        if len(town) > 1:
             # Could be the name of the town after taking out a comma, e.g. "Berlin, NJ"
-            town = placeFullName.split(",")
-            if town[0] in local_towns and state_abbreviation in town[1]:
+            if town[0] in self.localTowns and self.stateAbbreviation in town[1]:
                 return True
-        except Exception as e:
-            # Some problem. OK keep going.
-            pass
-        try:
             # Relax the constraint a little and ignore case.
-            town = placeFullName.split(",")
-            if state_full.lower() in town[1].lower() or state_abbreviation.lower() in town[1].lower():
+            town = placeFullNameLower.split(",")
+            if self.stateFullLower in town[1] or self.stateAbbreviationLower in town[1]:
                 # This is in the local state. Check town.
-                for interestedTown in local_towns:
-                    if town[0].lower() in interestedTown.lower():
+                for interestedTown in self.localTownsLower:
+                    if town[0] in interestedTown:
                         return True
-        except Exception as e:
-            # Some problem. OK keep going.
-            pass
         # Maybe the name has no comma in it? That's OK too.
-        try:
-            if state_abbreviation.lower() in placeFullName.lower() or state_full.lower() in placeFullName.lower():
-                # This is in the local state. Check town.
-                for interestedTown in local_towns:
-                    if interestedTown.lower() in placeFullName.lower():
-                        return True
-        except Exception as e:
-            # Some problem. OK keep going.
-            pass
+        if self.stateAbbreviationLower in placeFullNameLower or self.stateFullLower in placeFullNameLower:
+            # This is in the local state. Check town.
+            if self.localTownsPattern is not None and self.localTownsPattern.search(placeFullNameLower) is not None:
+                return True
         # No more places it could be...                           
         return False
 
@@ -522,7 +727,7 @@ class TwitterHelper:
         -- prose the message, must be less than 281 characters sans the name of the tweetOwner, will be rejected if not. Required. If None or empty is given, nothing happens other than a warning log.
         -- tweetOwner the screen name of the owner, without the @. Required. If None or empty is given, nothing happens other than a warning log.
         '''
-        if idoftweet is None or len(idoftweet) == 0:
+        if idoftweet is None or (not isinstance(idoftweet, int) and len(idoftweet) == 0):
             log.warn('Could not reply to the tweet ID given as it was None or empty')
             return
         if prose is None or len(prose) == 0:
@@ -532,19 +737,18 @@ class TwitterHelper:
             log.warn('Could not reply to the tweet ID given as the tweetOwner was None or empty')
             return
         # Make API call
-        api = tweepy.API(self.auth)        
         assembledMessage = '@' + tweetOwner + ' ' + prose
         # Tweets can not be more than 280 characters. Check and if that exceeds, print out a WARN.
         if len(assembledMessage) > 280:
-            log.warn('Tweet reply exceeds length of 280 characters. Ignoring this reply: ' + assembledMessage)
+            log.warn('Tweet reply exceeds length of 280 characters. Ignoring this reply: %s', assembledMessage)
             return
         reply = ''
-        log.debug('Replying to this tweet: ' + str(idoftweet) + ' with tweet: ' + assembledMessage)
+        log.debug('Replying to this tweet: %s with tweet: %s', idoftweet, assembledMessage)
         try:
-            reply = api.update_status(assembledMessage, in_reply_to_status_id=int(idoftweet))
+            reply = self.api.update_status(assembledMessage, in_reply_to_status_id=idoftweet if isinstance(idoftweet, int) else int(idoftweet))
             log.debug('Tweet sent!')
         except Exception as e:
-            log.warning('Error in replying to the tweet: ' + str(e) + ' with reply: ' + str(reply))
+            log.warning('Error in replying to the tweet: %s with reply: %s', e, reply)
 
             
 class ScoringHelper:
@@ -555,19 +759,74 @@ class ScoringHelper:
     
     def __init__(self, config):
         '''
-        Sets up the ScoringHelper using the configuration loaded from a file
+        Sets up the ScoringHelper using the configuration loaded from a file. The scoring section is read once here so that scoreContent does not parse it again for every record.
         
         -- config dictionary, the loaded properties from the configuration files for the bot. Required, if None then an error is logged and nothing happens.
         @see ConfigFileHelper
         '''
         self.conf = {}
+        # True once a scoring section of the right shape is found, see scoreContent.
+        self.hasScoring = False
+        # The points for each part of the score. None means that part is not configured and is left out of the score.
+        self.pointsPerWord = None
+        self.localityMultiplier = None
+        self.hashtagHeck = None
+        self.shoutoutHeck = None
+        self.referencesToMe = 0
+        # The keywords of interest and disinterest, lower cased with their points, see scoreContent.
+        self.interestedWords = []
+        self.disinterestedWords = []
+        # The user's own social media handles, lower cased.
+        self.socialMediaHandles = []
         if config is None:
             log.error('Failed to initialize ScoringHelper as provided config dictionary is None. ScoringHelper is not set up properly.')
             return
-        if isinstance(config, dict) is False:
+        if not isinstance(config, dict):
             log.error('Configuration passed into ScoringHelper is not a dictionary. ScoringHelper is not set up properly.')
             return
         self.conf = config
+        if 'scoring' not in self.conf:
+            return
+        if not isinstance(self.conf['scoring'], dict):
+            log.error('The scoring section in the configuration is not a dictionary. See DESIGN.md. ScoringHelper is not set up properly.')
+            return
+        self.hasScoring = True
+        scoringConf = self.conf['scoring']
+        if 'points_per_word' in scoringConf:
+            self.pointsPerWord = 0
+            try:
+                self.pointsPerWord = int(scoringConf['points_per_word'])
+            except Exception as e:
+                # Not an integer?
+                log.debug('Could not utilize points_per_word in the scoring section of the configuration: %s', e)
+        if 'locality_multiplier' in scoringConf:
+            self.localityMultiplier = 0
+            try:
+                self.localityMultiplier = int(scoringConf['locality_multiplier'])
+            except Exception as e:
+                # Not an integer?
+                log.debug('Could not utilize locality_multiplier in the scoring section of the configuration: %s', e)
+        self.interestedWords = _keyword_points(scoringConf, 'interested_words', 'interest')
+        self.disinterestedWords = _keyword_points(scoringConf, 'disinterested_words', 'disinterest')
+        if 'hashtag_heck' in scoringConf:
+            self.hashtagHeck = 0
+            try:
+                self.hashtagHeck = int(scoringConf['hashtag_heck'])
+            except Exception as e:
+                log.error('Hashtag heck value in the configuration is not an integer. Won\'t score on any hashtag')
+        if 'shoutout_heck' in scoringConf:
+            self.shoutoutHeck = 0
+            try:
+                self.shoutoutHeck = int(scoringConf['shoutout_heck'])
+            except Exception as e:
+                log.error('Shoutout heck value in the configuration is not an integer. Won\'t score on any shoutout')
+        if 'references_to_me' in scoringConf:
+            try:
+                self.referencesToMe = int(scoringConf['references_to_me'])
+            except Exception as e:
+                log.error('References to me value in the configuration is not an integer. Won\'t score on any reference to me.')
+        if 'user_identification' in self.conf and isinstance(self.conf['user_identification'], dict) and 'social_media_handles' in self.conf['user_identification'] and isinstance(self.conf['user_identification']['social_media_handles'], list):
+            self.socialMediaHandles = [handle.lower() for handle in self.conf['user_identification']['social_media_handles']]
         
     def scoreContent(self, record):
         '''
@@ -583,120 +842,81 @@ class ScoringHelper:
         if record is None:
             log.warning('Could not score data as None was passed in. Zero being returned')
             return scoreDictionary
-        if isinstance(record, dict) is False:
+        if not isinstance(record, dict):
             log.warning('Data passed into scoreContent is not a dictionary. Zero being returned')
             return scoreDictionary
-        # Similarly we need the section 'scoring' to be there too
-        if 'scoring' not in self.conf:
+        # Similarly we need the section 'scoring' to be there too. Its shape was checked once in __init__.
+        if not self.hasScoring:
             log.warning('There is no scoring section in the configuration. Returning 0.')
             return scoreDictionary
+        # Look up the parts of the record that are scored once.
+        text = record.get('text')
+        hashtags = record.get('hashtags')
+        references = record.get('references')
+        if not isinstance(references, list):
+            references = []
         # LENGTH - score points based on how many tokens arein the record.
-        if 'points_per_word' in self.conf['scoring']:
-            ppw = 0
+        if self.pointsPerWord is not None:
             lengthScore = 0
-            try:
-                ppw = int(self.conf['scoring']['points_per_word'])
-            except Exception as e:
-                # Not an integer?
-                log.debug('Could not utilize points_per_word in the scoring section of the configuration: ' + str(e))
-            if 'text' in record:
-                # Break up the text by space. Only count words that are actually not blank.
-                textParts = record['text'].split(' ')
-                for textPart in textParts:
-                    if len(textPart) > 0:
-                        lengthScore += ppw
+            if text is not None:
+                # Break up the text by whitespace, which never gives blank words. With no points per word there is nothing to count.
+                if self.pointsPerWord != 0:
+                    lengthScore = len(text.split()) * self.pointsPerWord
                 scoreDictionary['length'] = lengthScore
             else:
                 log.debug('Data record from Elastic Search had no text in it. No length based scoring was done.')
         # LOCALITY
         # TODO #6-Move-Locality-to-Mailbot. This should not come directly from the record but rather be determined here in this method with the record data.
         # Note: decided not to put a partial implementation of this in and will circle back to handle this later.
-        if 'locality_multiplier' in self.conf['scoring']:
-            lm = 0
-            try:
-                lm = int(self.conf['scoring']['locality_multiplier'])
-            except Exception as e:
-                # Not an integer?
-                log.debug('Could not utilize locality_multiplier in the scoring section of the configuration: ' + str(e))
-            if 'locality_confidence' in record:
-                localityMultiplierScore = float(lm) * record['locality_confidence']
+        if self.localityMultiplier is not None:
+            localityConfidence = record.get('locality_confidence')
+            if localityConfidence is not None:
+                localityMultiplierScore = float(self.localityMultiplier) * localityConfidence
                 scoreDictionary['locality_multiplier'] = localityMultiplierScore
         # TODO #7-Redesign-Follower-Scoring: Twitterchat had this capability but Mediamail has to implement this differently. It would need to be the follower of the user who gets the e-mail.
-        # KEYWORDS of INTEREST
+        # KEYWORDS of INTEREST and DISINTEREST
         scoreDictionary['keywords_of_interest'] = 0
-        if 'interested_words' in self.conf['scoring']:
-            # Parse each one, provided a dictionary was given.
-            if isinstance(self.conf['scoring']['interested_words'], dict) is False:
-                log.debug('Could not score keywords of interest, the value provided in the configuration is not a dictionary of string:int. See DESIGN.md.')
-            else:
-                # For each keyword, check to see if it is in the record tokens in part. If so, score the points.
-                for keyword in self.conf['scoring']['interested_words']:
-                    points = 0
-                    try:
-                        points = int(self.conf['scoring']['interested_words'][keyword])
-                    except Exception as e:
-                        log.debug('Keyword of interest has a non-integer value for word: ' + str(keyword))
-                    if 'text' in record and keyword.lower() in record['text'].lower():
-                        log.debug('Found a matching keyword: ' + str(keyword) + ' within the record.')
-                        scoreDictionary['keywords_of_interest'] += points
-        # KEYWORDS of DISINTEREST
         scoreDictionary['keywords_of_disinterest'] = 0
-        if 'disinterested_words' in self.conf['scoring']:
-            # Parse each one, provided a dictionary was given.
-            if isinstance(self.conf['scoring']['disinterested_words'], dict) is False:
-                log.debug('Could not score keywords of disinterest, the value provided in the configuration is not a dictionary of string:int. See DESIGN.md.')
-            else:
-                # For each keyword, check to see if it is in the record tokens in part. If so, score the points.
-                for keyword in self.conf['scoring']['disinterested_words']:
-                    points = 0
-                    try:
-                        points = int(self.conf['scoring']['disinterested_words'][keyword])
-                    except Exception as e:
-                        log.debug('Keyword of disinterest has a non-integer value for word: ' + str(keyword))
-                    if 'text' in record and keyword.lower() in record['text'].lower():
-                        log.debug('Found a matching keyword: ' + str(keyword) + ' within the record.')
-                        scoreDictionary['keywords_of_disinterest'] += points
+        # With no keywords configured there is nothing to look for, so the text is not even lower cased.
+        if text is not None and (len(self.interestedWords) > 0 or len(self.disinterestedWords) > 0):
+            # The keywords were lower cased in __init__, so only the text needs lower casing, once.
+            lowerText = text.lower()
+            # Matches are only logged when DEBUG is on, checked once rather than once per matching keyword.
+            debugEnabled = log.isEnabledFor(logging.DEBUG)
+            # For each keyword, check to see if it is in the record tokens in part. If so, score the points.
+            for keyword, points in self.interestedWords:
+                if keyword in lowerText:
+                    if debugEnabled:
+                        log.debug('Found a matching keyword: %s within the record.', keyword)
+                    scoreDictionary['keywords_of_interest'] += points
+            for keyword, points in self.disinterestedWords:
+                if keyword in lowerText:
+                    if debugEnabled:
+                        log.debug('Found a matching keyword: %s within the record.', keyword)
+                    scoreDictionary['keywords_of_disinterest'] += points
         # TODO #17-Eliminate-Interest-and-Disinterest-Word-Scoring: Having a distinction between these two (interest and disinterest) makes no sense. Rather just a global keyword scoring allowing any positive or negative number makes better sense.
         # TODO #9-Implement Derivative Message Scoring: Re-work the index to store a flag for derived messages like re-tweets and then score them separately.
         # HASHTAG and SHOUTOUT HECK
-        if 'hashtags' in record and isinstance(record['hashtags'], list) and len(record['hashtags']) > 0:
+        if isinstance(hashtags, list) and len(hashtags) > 0:
             # By getting here, there is a list of hashtags in the record that should be scored.
-            hh = 0
-            if 'hashtag_heck' in self.conf['scoring']:
-                try:
-                    hh = int(self.conf['scoring']['hashtag_heck'])
-                except Exception as e:
-                    log.error('Hashtag heck value in the configuration is not an integer. Won\'t score on any hashtag')
-                scoreDictionary['hashtags'] = (len(record['hashtags']) * hh)
-        if 'references' in record and isinstance(record['references'], list) and len(record['references']) > 0:
+            if self.hashtagHeck is not None:
+                scoreDictionary['hashtags'] = (len(hashtags) * self.hashtagHeck)
+        if len(references) > 0:
             # By getting here, there is a list of references in the record that should be scored.
-            sh = 0
-            if 'shoutout_heck' in self.conf['scoring']:
-                try:
-                    sh = int(self.conf['scoring']['shoutout_heck'])
-                except Exception as e:
-                    log.error('Shoutout heck value in the configuration is not an integer. Won\'t score on any shoutout')
-                scoreDictionary['references'] = (len(record['references']) * sh)
+            if self.shoutoutHeck is not None:
+                scoreDictionary['references'] = (len(references) * self.shoutoutHeck)
         # SHOUT OUTS TO ME
-        if 'user_identification' in self.conf and isinstance(self.conf['user_identification'], dict) and 'social_media_handles' in self.conf['user_identification'] and isinstance(self.conf['user_identification']['social_media_handles'], list) and len(self.conf['user_identification']['social_media_handles']) > 0:
+        if len(self.socialMediaHandles) > 0:
             # By getting here, there are social media handles associated with the user worth checking. 
             # If they exist in the references of the record, then additional scoring could happen.
-            rtm = 0
-            if 'references_to_me' in self.conf['scoring']:
-                try:
-                    rtm = int(self.conf['scoring']['references_to_me'])
-                except Exception as e:
-                    log.error('References to me value in the configuration is not an integer. Won\'t score on any reference to me.')
-            if 'references' in record and isinstance(record['references'], list) and len(record['references']) > 0:
-                for handle in self.conf['user_identification']['social_media_handles']:
-                    for reference in record['references']:
-                        if handle.lower() in reference.lower():
-                            # Match. The references contain @ whereas the handles do not have to.
-                            scoreDictionary['shoutouts_to_me'] = rtm
-        # Tally up the overall score
-        overall = 0
-        for component in scoreDictionary:
-            overall += scoreDictionary[component]
+            if len(references) > 0:
+                # Lower case each reference once rather than once per handle.
+                lowerReferences = [reference.lower() for reference in references]
+                # Match. The references contain @ whereas the handles do not have to.
+                if any(handle in reference for handle in self.socialMediaHandles for reference in lowerReferences):
+                    scoreDictionary['shoutouts_to_me'] = self.referencesToMe
+        # Tally up the overall score. The overall entry is still the zero it started at.
+        overall = sum(scoreDictionary.values())
         scoreDictionary['overall'] = overall         
-        log.debug('Assigning overall score value of: ' + str(overall) + ' to the record')
+        log.debug('Assigning overall score value of: %s to the record', overall)
         return scoreDictionary